@@ -12,10 +12,6 @@ import os
 # Configuration
 from src.core.config import FORM_URL, REQUEST_CONFIG, AUTOMATION_CONFIG, RABBITMQ_CONFIG
 
-# Modular imports
-from src.core.system import GoogleFormsAutomationSystem
-from src.utils.helpers import create_sample_csv
-
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -41,6 +37,7 @@ def run_cli_mode():
         logging.getLogger().setLevel(logging.DEBUG)
     
     if args.create_sample:
+        from src.utils.helpers import create_sample_csv
         create_sample_csv()
         return
     
@@ -57,22 +54,26 @@ def run_cli_mode():
     if args.file:
         file_ext = os.path.splitext(args.file)[1].lower()
         if file_ext not in ['.csv', '.xlsx', '.xls']:
-            logger.error(f"Unsupported file format: {file_ext}. Please use CSV or XLSX files.")
+            logger.error("Unsupported file format: %s. Please use CSV or XLSX files.", file_ext)
             return
         
         if not os.path.exists(args.file):
-            logger.error(f"File not found: {args.file}")
+            logger.error("File not found: %s", args.file)
             return
         
-        logger.info(f"📁 Data file: {args.file} ({file_ext.upper()})")
+        logger.info("📁 Data file: %s (%s)", args.file, file_ext.upper())
     
-    # Initialize system
+    # Initialize system (import di sini: pandas/selenium/pika hanya di-load jika memang dipakai)
+    from src.core.system import GoogleFormsAutomationSystem
     system = GoogleFormsAutomationSystem(
         FORM_URL, 
         REQUEST_CONFIG, 
         RABBITMQ_CONFIG, 
         AUTOMATION_CONFIG['timezone']
     )
+    system.set_submit_mode(AUTOMATION_CONFIG.get('submit_mode', 'selenium'))
+    system.set_http_concurrency(AUTOMATION_CONFIG.get('http_concurrency_factor', 4))
+    system.set_parsed_data_cache(AUTOMATION_CONFIG.get('cache_parsed_data', False))
     
     # Validate and set threading
     if args.threads < 1 or args.threads > 5:
@@ -94,22 +95,22 @@ def run_cli_mode():
     # Set threading configuration
     if headless_mode and args.threads > 1:
         system.set_threading_config(args.threads)
-        logger.info(f"🧵 Multi-threading enabled: {args.threads} concurrent browsers (headless)")
+        logger.info("🧵 Multi-threading enabled: %d concurrent browsers (headless)", args.threads)
     else:
         logger.info("🔄 Single-threaded processing")
     
     try:
         logger.info("🚀 Google Forms Automation System")
-        logger.info(f"📋 Mode: {args.mode}")
-        logger.info(f"📄 Form URL: {FORM_URL}")
+        logger.info("📋 Mode: %s", args.mode)
+        logger.info("📄 Form URL: %s", FORM_URL)
         
         if args.file:
-            logger.info(f"📊 Data File: {args.file}")
+            logger.info("📊 Data File: %s", args.file)
         
         logger.info("-" * 50)
         
         if args.mode == 'batch':
-            system.run_batch_mode(args.file)
+            system.run_batch_mode(args.file, AUTOMATION_CONFIG.get('batch_chunk_size', 1000))
         elif args.mode == 'scheduled':
             system.run_scheduled_mode(args.file)
         elif args.mode == 'worker':
@@ -118,7 +119,7 @@ def run_cli_mode():
     except KeyboardInterrupt:
         logger.info("⏹️ Stopping automation...")
     except Exception as e:
-        logger.error(f"System error: {e}")
+        logger.error("System error: %s", e)
     finally:
         system.cleanup()
 
@@ -129,13 +130,21 @@ def run_api_server(host: str = "0.0.0.0", port: int = 8000):
         from fastapi import FastAPI
         from src.api.endpoints.forms import router as forms_router
         
+        # orjson (opsional) jauh lebih cepat dari json stdlib untuk serialisasi response
+        try:
+            import orjson  # noqa: F401
+            from fastapi.responses import ORJSONResponse as DefaultResponse
+        except ImportError:
+            from fastapi.responses import JSONResponse as DefaultResponse
+        
         # Create FastAPI app
         app = FastAPI(
             title="Google Forms Automation API",
             description="API untuk otomasi pengisian Google Forms dengan data CSV/Excel",
             version="1.0.0",
             docs_url="/docs",
-            redoc_url="/redoc"
+            redoc_url="/redoc",
+            default_response_class=DefaultResponse
         )
         
         # Include routers
@@ -162,20 +171,20 @@ def run_api_server(host: str = "0.0.0.0", port: int = 8000):
             return {"status": "healthy", "service": "Google Forms Automation API"}
         
         logger.info("🚀 Starting Google Forms Automation API Server")
-        logger.info(f"📍 Server: http://{host}:{port}")
-        logger.info(f"📚 Docs: http://{host}:{port}/docs")
-        logger.info(f"🔄 ReDoc: http://{host}:{port}/redoc")
+        logger.info("📍 Server: http://%s:%s", host, port)
+        logger.info("📚 Docs: http://%s:%s/docs", host, port)
+        logger.info("🔄 ReDoc: http://%s:%s/redoc", host, port)
         logger.info("-" * 50)
         
         # Start server
         uvicorn.run(app, host=host, port=port)
         
     except ImportError as e:
-        logger.error(f"❌ FastAPI dependencies not installed: {e}")
+        logger.error("❌ FastAPI dependencies not installed: %s", e)
         logger.error("💡 Install with: pip install fastapi uvicorn python-multipart")
         sys.exit(1)
     except Exception as e:
-        logger.error(f"❌ Failed to start API server: {e}")
+        logger.error("❌ Failed to start API server: %s", e)
         sys.exit(1)
 
 def main():
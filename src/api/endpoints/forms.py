@@ -5,11 +5,14 @@ Endpoints untuk Google Forms processing dengan API Key protection dari config
 from fastapi import APIRouter, File, UploadFile, HTTPException, Form, Depends, Header
 from fastapi.security import APIKeyHeader
 from fastapi.responses import JSONResponse
+import asyncio
+import csv
+import shutil
 import tempfile
 import os
 import logging
+from pathlib import Path
 from typing import Optional
-import pandas as pd
 
 from ..schemas import (
     GoogleFormRequest, 
@@ -18,13 +21,15 @@ from ..schemas import (
     GoogleFormResponse, 
     FormAnalysisResponse, 
     FieldMappingResponse,
-    ProcessingStats
+    ProcessingStats,
+    GoogleFormUrl
 )
 from ..services import DynamicFormAnalyzer
 from ..services.job_tracker import job_tracker, JobStatus
 from ..services.background_processor import background_processor
 from ...core.system import GoogleFormsAutomationSystem
 from ...core.config import REQUEST_CONFIG, AUTOMATION_CONFIG, RABBITMQ_CONFIG, API_KEY
+from ...utils.helpers import read_data_file
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/forms", tags=["Google Forms"])
@@ -47,12 +52,34 @@ def verify_api_key(x_api_key: str = Depends(api_key_header)):
 # Initialize form analyzer
 form_analyzer = DynamicFormAnalyzer()
 
+# Ukuran chunk saat menyalin file upload ke disk
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+def _save_upload_to_temp(source, suffix: str, dir: Optional[str] = None) -> str:
+    """Salin stream upload ke temporary file per chunk (dijalankan di worker thread)"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=dir) as temp_file:
+        shutil.copyfileobj(source, temp_file, UPLOAD_CHUNK_SIZE)
+        return temp_file.name
+
+def _count_csv_rows(text_stream) -> int:
+    """Hitung baris CSV yang tidak kosong dengan csv.reader (tanpa pandas/dtype inference)"""
+    return sum(1 for row in csv.reader(text_stream) if row)
+
+def _probe_data_rows(path: str, file_ext: str) -> int:
+    """Hitung baris data tanpa memuat seluruh file CSV ke DataFrame"""
+    if file_ext == '.csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            return _count_csv_rows(f)
+    
+    # Excel tetap dibaca penuh: openpyxl harus mem-parse seluruh sheet untuk menghitung baris
+    return len(read_data_file(path, file_ext, header=None))
+
 @router.post("/process/")
 async def process_google_form_background(
-    form_url: str = Form(..., description="URL Google Form yang akan diproses"),
+    form_url: GoogleFormUrl = Form(..., description="URL Google Form yang akan diproses"),
     file: UploadFile = File(..., description="File CSV atau Excel yang berisi data"),
     headless: bool = Form(True, description="Jalankan browser dalam mode headless"),
-    threads: int = Form(1, description="Jumlah thread concurrent (1-5)"),
+    threads: int = Form(1, ge=1, le=5, description="Jumlah thread concurrent (1-5)"),
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -76,62 +103,47 @@ async def process_google_form_background(
                 detail=f"Format file tidak didukung: {file_ext}. Gunakan CSV atau XLSX."
             )
         
-        # Validasi thread count
-        if threads < 1 or threads > 5:
-            raise HTTPException(
-                status_code=400,
-                detail="Thread count harus antara 1-5"
-            )
-        
-        # Validasi URL format
-        if not form_url.startswith('https://docs.google.com/forms/'):
-            raise HTTPException(
-                status_code=400,
-                detail="URL harus berupa Google Forms URL yang valid"
-            )
-        
-        # Read file content
-        file_content = await file.read()
+        # Simpan file upload secara streaming ke temp dir background processor, di luar event loop
+        temp_file_path = await asyncio.to_thread(
+            _save_upload_to_temp, file.file, file_ext, background_processor.temp_dir
+        )
         
-        # Quick validation of file content  
         try:
-            if file_ext == '.csv':
-                df = pd.read_csv(pd.io.common.BytesIO(file_content), header=None)
-            else:
-                df = pd.read_excel(pd.io.common.BytesIO(file_content), header=None)
+            # Quick validation of file content (all rows are data, no header)
+            try:
+                rows_count = await asyncio.to_thread(_probe_data_rows, temp_file_path, file_ext)
+            except Exception as e:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid file format or content: {str(e)}"
+                )
             
-            if df.empty:
+            if rows_count == 0:
                 raise HTTPException(
                     status_code=400,
                     detail="File kosong atau tidak berisi data"
                 )
             
-            # Count all rows as data (no header row)
-            rows_count = len(df)
+            # Create background job
+            job_params = {
+                "form_url": form_url,
+                "filename": filename,
+                "rows_count": rows_count,
+                "headless": headless,
+                "threads": threads
+            }
+            
+            job_id = job_tracker.create_job("google_form_processing", job_params)
             
-        except Exception as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file format or content: {str(e)}"
+            # Start background processing; setelah ini temp file dihapus oleh background job
+            background_processor.process_form_async(
+                job_id, form_url, temp_file_path, filename, headless, threads
             )
+        except BaseException:
+            Path(temp_file_path).unlink(missing_ok=True)
+            raise
         
-        # Create background job
-        job_params = {
-            "form_url": form_url,
-            "filename": filename,
-            "rows_count": rows_count,
-            "headless": headless,
-            "threads": threads
-        }
-        
-        job_id = job_tracker.create_job("google_form_processing", job_params)
-        
-        # Start background processing
-        background_processor.process_form_async(
-            job_id, form_url, file_content, filename, headless, threads
-        )
-        
-        logger.info(f"🚀 Started background job {job_id} for form: {form_url}")
+        logger.info("🚀 Started background job %s for form: %s", job_id, form_url)
         
         return {
             "success": True,
@@ -151,7 +163,7 @@ async def process_google_form_background(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error starting background job: {str(e)}")
+        logger.error("❌ Error starting background job: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to start background job: {str(e)}"
@@ -159,10 +171,10 @@ async def process_google_form_background(
 
 @router.post("/process-sync/", response_model=GoogleFormResponse) 
 async def process_google_form_sync(
-    form_url: str = Form(..., description="URL Google Form yang akan diproses"),
+    form_url: GoogleFormUrl = Form(..., description="URL Google Form yang akan diproses"),
     file: UploadFile = File(..., description="File CSV atau Excel yang berisi data"),
     headless: bool = Form(True, description="Jalankan browser dalam mode headless"),
-    threads: int = Form(1, description="Jumlah thread concurrent (1-5)"),
+    threads: int = Form(1, ge=1, le=5, description="Jumlah thread concurrent (1-5)"),
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -194,44 +206,24 @@ async def process_google_form_sync(
                 detail=f"Format file tidak didukung: {file_ext}. Gunakan CSV atau XLSX."
             )
         
-        # Validasi thread count
-        if threads < 1 or threads > 5:
-            raise HTTPException(
-                status_code=400,
-                detail="Thread count harus antara 1-5"
-            )
-        
-        # Validasi URL format (basic check)
-        if not form_url.startswith('https://docs.google.com/forms/'):
-            raise HTTPException(
-                status_code=400,
-                detail="URL harus berupa Google Forms URL yang valid"
-            )
-        
-        logger.info(f"📋 Processing request - Form: {form_url}")
-        logger.info(f"📄 File: {filename} ({file_ext.upper()})")
-        logger.info(f"🔧 Headless: {headless}, Threads: {threads}")
+        logger.info("📋 Processing request - Form: %s", form_url)
+        logger.info("📄 File: %s (%s)", filename, file_ext.upper())
+        logger.info("🔧 Headless: %s, Threads: %d", headless, threads)
         
-        # Simpan file upload ke temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        # Simpan file upload ke temporary file secara streaming, di luar event loop
+        temp_file_path = await asyncio.to_thread(_save_upload_to_temp, file.file, file_ext)
         
         try:
             # Validasi data dalam file (all rows are data, no header)
-            if file_ext == '.csv':
-                df = pd.read_csv(temp_file_path, header=None)
-            else:
-                df = pd.read_excel(temp_file_path, header=None)
+            rows_count = await asyncio.to_thread(_probe_data_rows, temp_file_path, file_ext)
             
-            if df.empty:
+            if rows_count == 0:
                 raise HTTPException(
                     status_code=400,
                     detail="File kosong atau tidak berisi data"
                 )
             
-            logger.info(f"📊 Data rows: {len(df)}")
+            logger.info("📊 Data rows: %d", rows_count)
             
             # Inisialisasi sistem automasi dengan form URL dari request
             # Field types akan di-analyze otomatis oleh sistem
@@ -244,15 +236,20 @@ async def process_google_form_sync(
             
             # Setup konfigurasi browser
             system.set_headless_mode(headless)
+            system.set_submit_mode(AUTOMATION_CONFIG.get('submit_mode', 'selenium'))
+            system.set_http_concurrency(AUTOMATION_CONFIG.get('http_concurrency_factor', 4))
             
             # Setup threading jika diperlukan
             if headless and threads > 1:
                 system.set_threading_config(threads)
-                logger.info(f"🧵 Multi-threading enabled: {threads} concurrent browsers")
+                logger.info("🧵 Multi-threading enabled: %d concurrent browsers", threads)
             
             # Jalankan batch processing
             logger.info("🚀 Starting Google Forms automation...")
-            result = system.run_batch_mode(temp_file_path)
+            # Selenium bersifat blocking, jalankan di worker thread agar endpoint lain tetap responsif
+            await asyncio.to_thread(
+                system.run_batch_mode, temp_file_path, AUTOMATION_CONFIG.get('batch_chunk_size', 1000)
+            )
             
             # Prepare stats
             stats = ProcessingStats(
@@ -261,9 +258,6 @@ async def process_google_form_sync(
                 failed=system.stats['failed']
             )
             
-            if stats.processed > 0:
-                stats.success_rate = round((stats.succeeded / stats.processed) * 100, 2)
-            
             # Cleanup sistem
             system.cleanup()
             
@@ -273,7 +267,7 @@ async def process_google_form_sync(
                 data={
                     "form_url": form_url,
                     "file_processed": filename,
-                    "rows_processed": len(df),
+                    "rows_processed": rows_count,
                     "headless_mode": headless,
                     "threads_used": threads
                 },
@@ -282,14 +276,13 @@ async def process_google_form_sync(
             
         finally:
             # Hapus temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+            Path(temp_file_path).unlink(missing_ok=True)
                 
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
-        logger.error(f"❌ Processing error: {str(e)}")
+        logger.error("❌ Processing error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
@@ -313,7 +306,7 @@ async def analyze_form(
     """
     try:
         form_url = str(request.form_url)
-        logger.info(f"🔍 Analyzing form structure: {form_url}")
+        logger.info("🔍 Analyzing form structure: %s", form_url)
         
         # Analisis form
         analysis_result = form_analyzer.analyze_form(form_url)
@@ -336,7 +329,7 @@ async def analyze_form(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Form analysis error: {str(e)}")
+        logger.error("❌ Form analysis error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Form analysis failed: {str(e)}"
@@ -362,8 +355,8 @@ async def map_csv_fields(
         form_url = str(request.form_url)
         csv_headers = request.csv_headers
         
-        logger.info(f"🔗 Mapping CSV fields to form: {form_url}")
-        logger.info(f"📋 CSV headers: {csv_headers}")
+        logger.info("🔗 Mapping CSV fields to form: %s", form_url)
+        logger.info("📋 CSV headers: %s", csv_headers)
         
         # Lakukan mapping
         mapping_result = form_analyzer.map_csv_to_form(form_url, csv_headers)
@@ -385,7 +378,7 @@ async def map_csv_fields(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Field mapping error: {str(e)}")
+        logger.error("❌ Field mapping error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Field mapping failed: {str(e)}"
@@ -421,7 +414,7 @@ async def get_job_status(job_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error getting job status: {str(e)}")
+        logger.error("❌ Error getting job status: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to get job status: {str(e)}"
@@ -447,7 +440,7 @@ async def list_all_jobs():
         }
         
     except Exception as e:
-        logger.error(f"❌ Error listing jobs: {str(e)}")
+        logger.error("❌ Error listing jobs: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to list jobs: {str(e)}"
@@ -481,14 +474,14 @@ async def cancel_job(
         if job.status == JobStatus.PROCESSING:
             # Request cancellation - this will be checked in the processing loop
             job.cancel()
-            logger.info(f"🛑 Cancellation requested for job {job_id}")
+            logger.info("🛑 Cancellation requested for job %s", job_id)
         elif job.status == JobStatus.PENDING:
             # Job hasn't started yet, cancel immediately
             job.cancel()
-            logger.info(f"🛑 Cancelled pending job {job_id}")
+            logger.info("🛑 Cancelled pending job %s", job_id)
         else:
             # Job already completed/failed/cancelled
-            logger.info(f"ℹ️ Job {job_id} is already {job.status}")
+            logger.info("ℹ️ Job %s is already %s", job_id, job.status.value)
         
         return {
             "success": True,
@@ -499,7 +492,7 @@ async def cancel_job(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error cancelling job: {str(e)}")
+        logger.error("❌ Error cancelling job: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to cancel job: {str(e)}"
@@ -536,7 +529,7 @@ async def get_automation_config():
         }
         
     except Exception as e:
-        logger.error(f"❌ Error getting config: {str(e)}")
+        logger.error("❌ Error getting config: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to get config: {str(e)}"
@@ -2,7 +2,7 @@
 Schemas module untuk API
 """
 
-from .requests import GoogleFormRequest, FormAnalysisRequest, FieldMappingRequest
+from .requests import GoogleFormRequest, FormAnalysisRequest, FieldMappingRequest, GoogleFormUrl
 from .responses import (
     BaseResponse, 
     GoogleFormResponse, 
@@ -2,4 +2,4 @@
 Request schemas for API
 """
 
-from .requests import GoogleFormRequest, FormAnalysisRequest, FieldMappingRequest
\ No newline at end of file
+from .requests import GoogleFormRequest, FormAnalysisRequest, FieldMappingRequest, GoogleFormUrl
\ No newline at end of file
@@ -2,10 +2,22 @@
 Pydantic schemas untuk request models
 """
 
-from pydantic import BaseModel, HttpUrl, Field
-from typing import Optional
+import re
+from pydantic import AfterValidator, BaseModel, HttpUrl, Field
+from typing import Annotated, Optional
 from fastapi import UploadFile
 
+GOOGLE_FORMS_URL_PATTERN = re.compile(r'https://docs\.google\.com/forms/')
+
+def _check_google_forms_url(url: str) -> str:
+    """Pastikan URL mengarah ke Google Forms"""
+    if not GOOGLE_FORMS_URL_PATTERN.match(url):
+        raise ValueError("URL harus berupa Google Forms URL yang valid")
+    return url
+
+# URL disimpan apa adanya (str) agar query prefilled tidak dinormalisasi
+GoogleFormUrl = Annotated[str, AfterValidator(_check_google_forms_url)]
+
 class GoogleFormRequest(BaseModel):
     """Schema untuk request processing Google Form"""
     form_url: HttpUrl = Field(..., description="URL Google Form yang akan diproses")
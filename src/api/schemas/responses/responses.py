@@ -2,7 +2,7 @@
 Pydantic schemas untuk response models
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 from typing import Optional, Dict, Any, List
 
 class BaseResponse(BaseModel):
@@ -15,7 +15,12 @@ class ProcessingStats(BaseModel):
     processed: int = 0
     succeeded: int = 0
     failed: int = 0
-    success_rate: Optional[float] = None
+
+    @computed_field
+    @property
+    def success_rate(self) -> float:
+        """Persentase sukses (2 desimal); 0 jika belum ada yang diproses"""
+        return round(100.0 * self.succeeded / max(self.processed, 1), 2)
 
 class GoogleFormResponse(BaseResponse):
     """Schema untuk response processing Google Form"""
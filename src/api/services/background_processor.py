@@ -6,12 +6,14 @@ import logging
 import os
 import threading
 import tempfile
+from pathlib import Path
 from typing import Dict, Any
-import pandas as pd
 from datetime import datetime
 
 from ...core.system import GoogleFormsAutomationSystem
 from ...core.config import REQUEST_CONFIG, AUTOMATION_CONFIG, RABBITMQ_CONFIG
+from ...data.csv_reader import CSVDataReader
+from ..schemas import ProcessingStats
 from .job_tracker import job_tracker, JobStatus
 
 logger = logging.getLogger(__name__)
@@ -23,12 +25,15 @@ class BackgroundProcessor:
         self.temp_dir = "temp"
         os.makedirs(self.temp_dir, exist_ok=True)
     
-    def process_form_async(self, job_id: str, form_url: str, file_content: bytes, 
+    def process_form_async(self, job_id: str, form_url: str, temp_file_path: str, 
                           filename: str, headless: bool = True, threads: int = 1):
-        """Process Google Form in background thread"""
+        """Process Google Form in background thread
+        
+        temp_file_path adalah file upload yang sudah disimpan endpoint; job ini
+        yang menghapusnya setelah selesai.
+        """
         
         def _process():
-            temp_file_path = None
             try:
                 job = job_tracker.get_job(job_id)
                 if not job:
@@ -45,17 +50,6 @@ class BackgroundProcessor:
                     logger.info(f"Job {job_id} was cancelled before processing")
                     return
                 
-                job_tracker.update_job_progress(job_id, 5, "Saving uploaded file...")
-                
-                # Save file to temp directory with timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                file_ext = os.path.splitext(filename)[1]
-                temp_filename = f"{job_id}_{timestamp}{file_ext}"
-                temp_file_path = os.path.join(self.temp_dir, temp_filename)
-                
-                with open(temp_file_path, 'wb') as f:
-                    f.write(file_content)
-                
                 job_tracker.update_job_progress(job_id, 10, "Reading file data...")
                 
                 # Check for cancellation
@@ -63,16 +57,15 @@ class BackgroundProcessor:
                     logger.info(f"Job {job_id} cancelled during file reading")
                     return
                 
-                # Read and validate file (all rows are data, no header)
-                if file_ext.lower() == '.csv':
-                    df = pd.read_csv(temp_file_path, header=None)
-                else:
-                    df = pd.read_excel(temp_file_path, header=None)
+                # Read and validate file sekali; reader yang sama dipakai untuk deteksi ETA dan processing
+                reader = CSVDataReader(temp_file_path, form_url)
+                if not reader.load_data():
+                    raise Exception("Failed to load CSV/Excel data")
                 
-                if df.empty:
+                if reader.df.empty:
                     raise Exception("File kosong atau tidak berisi data")
                 
-                rows_count = len(df)
+                rows_count = len(reader.df)
                 job_tracker.update_job_progress(job_id, 20, f"File loaded: {rows_count} rows")
                 
                 # Check for cancellation
@@ -99,6 +92,8 @@ class BackgroundProcessor:
                 
                 # Configure system
                 system.set_headless_mode(headless)
+                system.set_submit_mode(AUTOMATION_CONFIG.get('submit_mode', 'selenium'))
+                system.set_http_concurrency(AUTOMATION_CONFIG.get('http_concurrency_factor', 4))
                 
                 if headless and threads > 1:
                     system.set_threading_config(threads)
@@ -137,27 +132,28 @@ class BackgroundProcessor:
                 
                 job_tracker.update_job_progress(job_id, 35, "Starting form processing...")
                 
-                # Check if file has ETA data by reading jobs first
-                from ...data.csv_reader import CSVDataReader
-                reader = CSVDataReader(temp_file_path, form_url)
-                if not reader.load_data():
-                    raise Exception("Failed to load CSV/Excel data")
-                
-                jobs = reader.get_job_list(system.scheduler.timezone.zone)
-                
                 # Check if any job has ETA for future scheduling
-                has_eta = any(job.get('eta') is not None for job in jobs)
+                # (lazy: berhenti di chunk pertama yang punya ETA, tanpa membangun semua job)
+                has_eta = any(
+                    job.get('eta') is not None
+                    for job in reader.iter_jobs(
+                        system.scheduler.timezone.zone,
+                        AUTOMATION_CONFIG.get('batch_chunk_size', 1000)
+                    )
+                )
                 
                 if has_eta:
                     logger.info(f"📅 ETA detected in file, using scheduled mode")
                     job_tracker.update_job_progress(job_id, 40, "ETA detected, using scheduled mode...")
                     # Run scheduled processing
-                    system.run_scheduled_mode(temp_file_path)
+                    system.run_scheduled_mode(temp_file_path, reader=reader)
                 else:
                     logger.info(f"📦 No ETA detected, using batch mode")
                     job_tracker.update_job_progress(job_id, 40, "No ETA detected, using batch mode...")
                     # Run batch processing
-                    system.run_batch_mode(temp_file_path)
+                    system.run_batch_mode(
+                        temp_file_path, AUTOMATION_CONFIG.get('batch_chunk_size', 1000), reader=reader
+                    )
                 
                 job_tracker.update_job_progress(job_id, 95, "Processing completed, finalizing...")
                 
@@ -168,12 +164,7 @@ class BackgroundProcessor:
                     "rows_processed": rows_count,
                     "headless_mode": headless,
                     "threads_used": threads,
-                    "stats": {
-                        "processed": system.stats['processed'],
-                        "succeeded": system.stats['succeeded'], 
-                        "failed": system.stats['failed'],
-                        "success_rate": round((system.stats['succeeded'] / system.stats['processed']) * 100, 2) if system.stats['processed'] > 0 else 0
-                    },
+                    "stats": ProcessingStats(**system.stats).model_dump(),
                     "completed_at": datetime.now().isoformat()
                 }
                 
@@ -189,12 +180,11 @@ class BackgroundProcessor:
             
             finally:
                 # Clean up temp file
-                if temp_file_path and os.path.exists(temp_file_path):
-                    try:
-                        os.unlink(temp_file_path)
-                        logger.info(f"Cleaned up temp file: {temp_file_path}")
-                    except Exception as e:
-                        logger.warning(f"Failed to cleanup temp file {temp_file_path}: {e}")
+                try:
+                    Path(temp_file_path).unlink(missing_ok=True)
+                    logger.info(f"Cleaned up temp file: {temp_file_path}")
+                except Exception as e:
+                    logger.warning(f"Failed to cleanup temp file {temp_file_path}: {e}")
         
         # Start processing in background thread
         thread = threading.Thread(target=_process, daemon=True)
@@ -2,8 +2,11 @@
 Google Forms automation module using Selenium - Fixed for concurrency issues
 """
 
+import json
 import logging
+import re
 import time
+import threading
 import os
 import tempfile
 import uuid
@@ -17,27 +20,97 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from ..utils.url_parser import extract_entry_order_from_url, generate_prefilled_url
+from ..utils.url_parser import (
+    extract_entry_order_from_url,
+    generate_prefilled_url,
+    get_clean_form_url,
+)
 from ..utils.field_analyzer import (
     analyze_field_types_from_url,
+    fields_by_type,
+    fields_with_other_option,
     generate_prefilled_url_with_types,
 )
 import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Field types that Google accepts as plain formResponse POST fields
+HTTP_SUBMIT_FIELD_TYPES = frozenset({"text", "radio", "checkbox", "select", "number"})
+
+# Status yang aman dicoba ulang untuk POST: Google menolak request tanpa mencatatnya.
+# 500/502/504 tidak termasuk karena jawaban mungkin sudah tercatat (submit ganda).
+HTTP_RETRY_STATUSES = (429, 503)
+
+# Data form (termasuk daftar item) yang di-embed Google di halaman viewform
+FORM_LOAD_DATA_PATTERN = re.compile(r"FB_PUBLIC_LOAD_DATA_\s*=\s*(.*?);\s*</script>", re.S)
+FORM_ITEM_PAGE_BREAK = 8  # Tipe item "section" di FB_PUBLIC_LOAD_DATA_
+
+# Teks/elemen halaman konfirmasi setelah jawaban tercatat (huruf kecil)
+SUBMIT_SUCCESS_INDICATORS = (
+    "your response has been recorded",
+    "thank you",
+    "terima kasih",
+    "response recorded",
+    "submitted successfully",
+)
+HTTP_CONFIRMATION_MARKERS = SUBMIT_SUCCESS_INDICATORS + (
+    "freebirdformviewerviewresponseconfirmationmessage",
+)
+
+
+def _append_single_value(payload: List[tuple], entry_key: str, value: str):
+    """Post the value as one formResponse field"""
+    payload.append((entry_key, value))
+
+
+def _append_multi_value(payload: List[tuple], entry_key: str, value: str):
+    """Post each comma separated checkbox choice as its own field"""
+    if "," not in value:
+        payload.append((entry_key, value))
+        return
+    for val in value.split(","):
+        val = " ".join(val.strip().split())
+        if val:
+            payload.append((entry_key, val))
+
 
 class GoogleFormAutomation:
     """Google Forms automation class using Selenium with improved concurrency handling"""
 
+    __slots__ = (
+        "form_url",
+        "entry_fields",
+        "field_types",
+        "payload_plan",
+        "page_count",
+        "request_config",
+        "driver",
+        "session",
+        "session_lock",
+        "http_pool_size",
+        "headless_mode",
+        "temp_dirs",
+        "driver_dirs",
+    )
+
     def __init__(self, form_url: str, request_config: Dict = None):
         self.form_url = form_url
         self.entry_fields = []
         self.field_types = {}
+        self.payload_plan = None  # (entry_key, append_fn) pairs, built from field_types
+        self.page_count = None  # Jumlah section form; None = belum dicek, 0 = tidak diketahui
         self.request_config = request_config or {}
         self.driver = None
+        self.session = None  # HTTP session for direct submissions
+        self.session_lock = threading.Lock()  # Worker HTTP pertama berebut membuat session
+        self.http_pool_size = 10  # keep-alive connections per host (requests default)
         self.headless_mode = True  # Default to headless
         self.temp_dirs = []  # Track temp directories for cleanup
+        self.driver_dirs = {}  # driver -> Chrome user-data-dir miliknya
         self._register_cleanup()
 
     def _register_cleanup(self):
@@ -46,13 +119,21 @@ class GoogleFormAutomation:
 
     def _cleanup_temp_dirs(self):
         """Clean up temporary directories"""
-        for temp_dir in self.temp_dirs:
-            try:
-                if os.path.exists(temp_dir):
-                    shutil.rmtree(temp_dir, ignore_errors=True)
-                    logger.debug(f"🧹 Cleaned up temp directory: {temp_dir}")
-            except Exception as e:
-                logger.debug(f"Failed to cleanup temp directory {temp_dir}: {e}")
+        for temp_dir in list(self.temp_dirs):
+            self._remove_temp_dir(temp_dir)
+
+    def _remove_temp_dir(self, temp_dir: str):
+        """Remove one temporary directory and stop tracking it"""
+        try:
+            if os.path.exists(temp_dir):
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                logger.debug(f"🧹 Cleaned up temp directory: {temp_dir}")
+        except Exception as e:
+            logger.debug(f"Failed to cleanup temp directory {temp_dir}: {e}")
+        try:
+            self.temp_dirs.remove(temp_dir)
+        except ValueError:
+            pass
 
     def set_headless_mode(self, headless: bool):
         """Set headless mode for browser automation"""
@@ -62,13 +143,12 @@ class GoogleFormAutomation:
         self, csv_headers: List[str] = None
     ) -> tuple[List[str], Optional[str]]:
         """Extract entry IDs from CSV headers or URL with field type analysis"""
+        self.payload_plan = None
+        self.page_count = None
         try:
             # If we have CSV headers, use them directly
             if csv_headers:
-                entry_fields = []
-                for header in csv_headers:
-                    if header.startswith("entry."):
-                        entry_fields.append(header)
+                entry_fields = [h for h in csv_headers if h.startswith("entry.")]
 
                 if entry_fields:
                     self.entry_fields = entry_fields
@@ -133,6 +213,7 @@ class GoogleFormAutomation:
     def setup_driver(self, headless: bool = True) -> webdriver.Chrome:
         """Setup Chrome driver with improved concurrency handling"""
         chrome_options = Options()
+        user_data_dir = None
 
         # Create unique user data directory with better collision avoidance
         try:
@@ -238,6 +319,8 @@ class GoogleFormAutomation:
             driver.execute_script(
                 "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
             )
+            if user_data_dir:
+                self.driver_dirs[driver] = user_data_dir
             headless_msg = "headless" if headless else "visible"
             logger.info(
                 f"✅ Chrome driver initialized successfully ({headless_msg}, port: {debug_port})"
@@ -246,6 +329,8 @@ class GoogleFormAutomation:
 
         except Exception as e:
             logger.error(f"❌ Failed to initialize Chrome driver: {e}")
+            if user_data_dir:
+                self._remove_temp_dir(user_data_dir)
             if "user data directory is already in use" in str(e):
                 logger.error("💡 Concurrency issue detected.")
                 try:
@@ -261,17 +346,29 @@ class GoogleFormAutomation:
             raise
 
     def cleanup_driver(self, driver):
-        """Properly cleanup driver and temp directories"""
-        if driver:
-            try:
-                driver.quit()
-                logger.debug("🚪 Browser closed")
-            except Exception as e:
-                logger.debug(f"Error closing browser: {e}")
+        """Quit a driver and remove only its own temp profile directory
 
-        # Clean up temp directories immediately
-        self._cleanup_temp_dirs()
-        self.temp_dirs.clear()
+        Other drivers (e.g. still checked out of a pool) keep their profiles.
+        """
+        if not driver:
+            return
+        try:
+            driver.quit()
+            logger.debug("🚪 Browser closed")
+        except Exception as e:
+            logger.debug(f"Error closing browser: {e}")
+
+        user_data_dir = self.driver_dirs.pop(driver, None)
+        if user_data_dir:
+            self._remove_temp_dir(user_data_dir)
+
+    def is_driver_alive(self, driver) -> bool:
+        """Check whether a driver session can still be used"""
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
 
     def fill_field_if_present(self, driver, entry_name: str, value: str) -> bool:
         """Fill field if present in current section with intelligent field matching"""
@@ -449,45 +546,206 @@ class GoogleFormAutomation:
 
         return None
 
-    def submit_form(self, form_data: Dict) -> bool:
-        """Submit form using Selenium with advanced multi-section navigation and improved error handling"""
-        driver = None
+    def clean_form_data(self, form_data: Dict) -> Dict[str, str]:
+        """Clean form data: normalize multiple spaces to single space and strip"""
+        cleaned_form_data = {}
+        for key, value in form_data.items():
+            if pd.notna(value) and str(value).strip():
+                cleaned_value = " ".join(str(value).strip().split())
+
+                # Remove .0 from float numbers (e.g., 9.0 -> 9, but keep 9.5 as 9.5)
+                try:
+                    # Check if it's a number that ends with .0
+                    if (
+                        "." in cleaned_value
+                        and cleaned_value.replace(".", "")
+                        .replace("-", "")
+                        .isdigit()
+                    ):
+                        float_val = float(cleaned_value)
+                        if float_val.is_integer():
+                            cleaned_value = str(int(float_val))
+                except ValueError:
+                    # Not a number, keep as is
+                    pass
+
+                cleaned_form_data[key] = cleaned_value
+
+        return cleaned_form_data
+
+    def supports_http_submit(self) -> bool:
+        """Check if every analyzed field can be posted directly without a browser
+
+        Forms with an "Other" option are left to Selenium: the payload would need
+        entry.N=__other_option__ plus entry.N.other_option_response, and a prefilled
+        URL does not list every choice, so free text cannot be told apart reliably.
+        Forms whose section count cannot be determined are left to Selenium too,
+        because Google ignores a POST whose pageHistory skips a section.
+        """
+        return (
+            bool(self.field_types)
+            and fields_by_type(self.form_url).keys() <= HTTP_SUBMIT_FIELD_TYPES
+            and not fields_with_other_option(self.form_url)
+            and self.get_page_count() > 0
+        )
+
+    def get_page_count(self) -> int:
+        """Number of form sections (0 if unknown), detected once per form URL
+
+        REQUEST_CONFIG['page_count'] overrides the detection for forms whose page
+        cannot be fetched or parsed.
+        """
+        if self.page_count is None:
+            configured = self.request_config.get("page_count")
+            self.page_count = configured if configured else self._detect_page_count()
+        return self.page_count
+
+    def _detect_page_count(self) -> int:
+        """Count sections from the form items embedded in the viewform page"""
         try:
-            logger.info("🔄 Starting advanced Selenium form submission")
-            logger.info(f"📊 Form data: {len(form_data)} fields to fill")
+            response = self._get_session().get(
+                self.form_url.split("?")[0],
+                timeout=self.request_config.get("timeout", 30),
+            )
+            response.raise_for_status()
+            match = FORM_LOAD_DATA_PATTERN.search(response.text)
+            if not match:
+                logger.warning("⚠️  Form data not found on form page; section count unknown")
+                return 0
+
+            items = json.loads(match.group(1))[1][1] or []
+            page_count = 1 + sum(
+                1 for item in items if len(item) > 3 and item[3] == FORM_ITEM_PAGE_BREAK
+            )
+            logger.info(f"📄 Detected {page_count} form section(s)")
+            return page_count
+
+        except (requests.RequestException, ValueError, IndexError, TypeError) as e:
+            logger.warning(f"⚠️  Could not detect form sections: {e}")
+            return 0
+
+    def _get_session(self) -> requests.Session:
+        """Lazily create the HTTP session used for direct submissions (thread-safe)"""
+        session = self.session
+        if session is not None:
+            return session
+        with self.session_lock:
+            if self.session is None:
+                self.session = self._create_session()
+            return self.session
+
+    def _create_session(self) -> requests.Session:
+        """Build a session with retries and a pool sized for the submit workers"""
+        session = requests.Session()
+        retry = Retry(
+            total=self.request_config.get("retries", 3),
+            read=0,  # request already sent: a re-POST could duplicate the response
+            backoff_factor=0.5,  # urllib3 2.x sleeps 0s, 1s, 2s, ... (or Retry-After)
+            status_forcelist=HTTP_RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,  # return the last response; caller checks status
+        )
+        # One pooled keep-alive connection per concurrent worker, so parallel
+        # POSTs reuse TLS connections instead of discarding them when the pool is full
+        adapter = HTTPAdapter(pool_maxsize=self.http_pool_size, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(self.request_config.get("headers", {}))
+        return session
+
+    def set_http_pool_size(self, size: int):
+        """Size the HTTP connection pool to the number of concurrent submit workers"""
+        self.http_pool_size = max(size, 1)
+        self.close_session()
+
+    def close_session(self):
+        """Close the HTTP session and its keep-alive connections"""
+        with self.session_lock:
+            if self.session is not None:
+                self.session.close()
+                self.session = None
+
+    def _get_payload_plan(self) -> List[tuple]:
+        """Resolve the append handler of every entry once, in URL entry order"""
+        if self.payload_plan is None:
+            self.payload_plan = [
+                (
+                    entry_key,
+                    _append_multi_value
+                    if self.field_types.get(entry_key, {}).get("multiple_values", False)
+                    else _append_single_value,
+                )
+                for entry_key in extract_entry_order_from_url(self.form_url)
+            ]
+        return self.payload_plan
+
+    def build_submission_payload(self, form_data: Dict[str, str]) -> List[tuple]:
+        """Build formResponse POST fields in URL entry order, splitting checkbox values"""
+        payload = []
+        for entry_key, append_value in self._get_payload_plan():
+            value = form_data.get(entry_key)
+            if value:
+                append_value(payload, entry_key, value)
+
+        # Semua section harus tercantum, kalau tidak Google tidak mencatat jawaban
+        payload.append(("fvv", "1"))
+        payload.append(("pageHistory", ",".join(str(i) for i in range(self.get_page_count()))))
+        return payload
+
+    def submit_form_http(self, form_data: Dict) -> bool:
+        """Submit form with a direct POST to the formResponse endpoint (no browser)"""
+        try:
+            cleaned_form_data = self.clean_form_data(form_data)
+            payload = self.build_submission_payload(cleaned_form_data)
+            logger.info(f"📤 Posting {len(cleaned_form_data)} fields via HTTP")
+
+            response = self._get_session().post(
+                get_clean_form_url(self.form_url),
+                data=payload,
+                timeout=self.request_config.get("timeout", 30),
+            )
 
-            # Clean form data: normalize multiple spaces to single space and strip
-            cleaned_form_data = {}
-            for key, value in form_data.items():
-                if pd.notna(value) and str(value).strip():
-                    cleaned_value = " ".join(str(value).strip().split())
+            if response.status_code != 200:
+                logger.warning(f"⚠️  HTTP submission rejected: status {response.status_code}")
+                return False
 
-                    # Remove .0 from float numbers (e.g., 9.0 -> 9, but keep 9.5 as 9.5)
-                    try:
-                        # Check if it's a number that ends with .0
-                        if (
-                            "." in cleaned_value
-                            and cleaned_value.replace(".", "")
-                            .replace("-", "")
-                            .isdigit()
-                        ):
-                            float_val = float(cleaned_value)
-                            if float_val.is_integer():
-                                cleaned_value = str(int(float_val))
-                    except ValueError:
-                        # Not a number, keep as is
-                        pass
+            # Google juga membalas 200 saat jawaban ditolak (form dikembalikan),
+            # jadi sukses hanya jika halaman konfirmasi yang muncul
+            page_content = response.text.lower()
+            if any(marker in page_content for marker in HTTP_CONFIRMATION_MARKERS):
+                logger.info("🎉 Form submitted successfully (HTTP)")
+                return True
 
-                    cleaned_form_data[key] = cleaned_value
+            logger.warning("⚠️  HTTP submission not recorded: no confirmation page in response")
+            return False
+
+        except requests.RequestException as e:
+            logger.error(f"❌ HTTP submission error: {e}")
+            return False
+
+    def submit_form(self, form_data: Dict, driver: webdriver.Chrome = None) -> bool:
+        """Submit form using Selenium with advanced multi-section navigation and improved error handling
+
+        If a driver is passed in (e.g. from a warm pool) it is reused and left open for the caller.
+        """
+        owns_driver = driver is None
+        try:
+            logger.info("🔄 Starting advanced Selenium form submission")
+            logger.info(f"📊 Form data: {len(form_data)} fields to fill")
+
+            cleaned_form_data = self.clean_form_data(form_data)
 
             logger.info(
                 f"📊 Cleaned form data: {len(cleaned_form_data)} non-empty fields"
             )
 
             # Setup driver with current headless setting
-            driver = self.setup_driver(headless=self.headless_mode)
-            headless_msg = "headless" if self.headless_mode else "visible browser"
-            logger.info(f"🌐 Chrome driver initialized ({headless_msg})")
+            if owns_driver:
+                driver = self.setup_driver(headless=self.headless_mode)
+                headless_msg = "headless" if self.headless_mode else "visible browser"
+                logger.info(f"🌐 Chrome driver initialized ({headless_msg})")
+            else:
+                logger.info("🌐 Reusing pooled Chrome driver")
 
             # Generate prefilled URL with field type awareness
             entry_order = extract_entry_order_from_url(self.form_url)
@@ -526,14 +784,9 @@ class GoogleFormAutomation:
 
             # Show field type analysis if available
             if self.field_types:
-                type_counts = {}
-                for info in self.field_types.values():
-                    field_type = info["type"]
-                    type_counts[field_type] = type_counts.get(field_type, 0) + 1
-
                 logger.info("📊 Field types found:")
-                for field_type, count in type_counts.items():
-                    logger.info(f"  - {field_type}: {count} fields")
+                for field_type, entries in fields_by_type(self.form_url).items():
+                    logger.info(f"  - {field_type}: {len(entries)} fields")
 
             # Navigate through multi-section form with enhanced error handling
             section_num = 1
@@ -590,7 +843,8 @@ class GoogleFormAutomation:
                 )
 
                 # Check for missing fields that should be here but aren't visible
-                section_entries = (
+                # (frozenset: membership dicek untuk setiap entry di form data)
+                section_entries = frozenset(
                     [inp.get_attribute("name") for inp in current_inputs]
                     + [ta.get_attribute("name") for ta in current_textareas]
                     + [sel.get_attribute("name") for sel in current_selects]
@@ -609,10 +863,7 @@ class GoogleFormAutomation:
                 for entry_key, value in cleaned_form_data.items():
                     if entry_key not in section_entries:
                         base_entry = entry_key.replace("_sentinel", "")
-                        sentinel_exists = any(
-                            base_entry + "_sentinel" in name for name in section_entries
-                        )
-                        if sentinel_exists:
+                        if base_entry + "_sentinel" in section_entries:
                             missing_fields[entry_key] = value
 
                 if missing_fields:
@@ -696,16 +947,8 @@ class GoogleFormAutomation:
             logger.info(f"  Page title: {page_title}")
 
             # Check for success indicators
-            success_indicators = [
-                "your response has been recorded",
-                "thank you",
-                "terima kasih",
-                "response recorded",
-                "submitted successfully",
-            ]
-
             success_found = any(
-                indicator in page_content for indicator in success_indicators
+                indicator in page_content for indicator in SUBMIT_SUCCESS_INDICATORS
             )
 
             # Check for error indicators
@@ -743,8 +986,9 @@ class GoogleFormAutomation:
             return False
 
         finally:
-            # Enhanced cleanup
-            self.cleanup_driver(driver)
+            # Enhanced cleanup (pooled drivers are returned by the caller)
+            if owns_driver:
+                self.cleanup_driver(driver)
 
     def is_next_button(self, button_text: str) -> bool:
         """Check if button text indicates a next/continue button"""
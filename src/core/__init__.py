@@ -2,6 +2,13 @@
 Core system modules
 """
 
-from .system import GoogleFormsAutomationSystem
+__all__ = ['GoogleFormsAutomationSystem']
 
-__all__ = ['GoogleFormsAutomationSystem']
\ No newline at end of file
+
+def __getattr__(name):
+    # System (pandas, selenium, pika) baru di-import saat dipakai, supaya
+    # `from src.core.config import ...` tetap ringan
+    if name == 'GoogleFormsAutomationSystem':
+        from .system import GoogleFormsAutomationSystem
+        return GoogleFormsAutomationSystem
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -4,6 +4,7 @@ Semua setting global ada di sini
 """
 
 import os
+from types import MappingProxyType
 
 # ===== FORM CONFIGURATION =====
 FORM_URL = ''
@@ -20,33 +21,39 @@ except ImportError:
     JOB_MAPPING_ENABLED = False
 
 # ===== HTTP REQUEST SETTINGS =====
-REQUEST_CONFIG = {
-    'headers': {
+# Config dibekukan (read-only) karena dibagi antar request/thread secara bersamaan
+REQUEST_CONFIG = MappingProxyType({
+    'headers': MappingProxyType({
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    },
+    }),
     'timeout': 30,  # seconds
-    'retries': 3
-}
+    'retries': 3,
+    'page_count': None  # Jumlah section form untuk pageHistory submit HTTP (None = deteksi dari halaman form)
+})
 
 # ===== AUTOMATION SETTINGS =====
-AUTOMATION_CONFIG = {
+AUTOMATION_CONFIG = MappingProxyType({
     'verbose': True,          # Show detailed output
     'dry_run': False,        # Set True untuk test tanpa submit
     'delay_between_submits': 1,  # seconds (jika submit multiple)
     'auto_extract_fields': True,  # Otomatis extract field IDs dari form
+    'submit_mode': 'selenium',    # 'selenium' (browser) atau 'http' (POST langsung, jauh lebih cepat)
+    'http_concurrency_factor': 4, # POST paralel per thread di mode 'http' (naikkan hati-hati, Google bisa balas 429)
+    'batch_chunk_size': 1000,     # Jumlah baris per chunk saat batch mode (membatasi memori job list)
+    'cache_parsed_data': False,   # Simpan hasil parse CSV/Excel ke <file>.cache.parquet (CLI, butuh pyarrow; batch CSV dibaca penuh, tidak di-stream)
     
     # ===== TIMEZONE SETTINGS =====
     'timezone': 'Asia/Jakarta',   # WIB timezone
     'eta_format': '%Y-%m-%d %H:%M:%S',  # Format ETA di CSV
     'show_timezone_info': True    # Show timezone info dalam logs
-}
+})
 
 # ===== RABBITMQ CONFIGURATION =====
-RABBITMQ_CONFIG = {
+RABBITMQ_CONFIG = MappingProxyType({
     'host': 'localhost',
     'port': 5672,
     'username': 'guest',
     'password': 'guest',
     'virtual_host': '/',
     'queue_name': 'google_forms_jobs'
-}
\ No newline at end of file
+})
\ No newline at end of file
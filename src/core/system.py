@@ -17,6 +17,10 @@ from ..data.csv_reader import CSVDataReader
 
 logger = logging.getLogger(__name__)
 
+# Submit HTTP tidak membuka browser per thread, jadi tiap "thread" boleh dikalikan.
+# Default sengaja kecil: terlalu banyak POST paralel memicu 429 dari Google
+DEFAULT_HTTP_CONCURRENCY_FACTOR = 4
+
 
 class GoogleFormsAutomationSystem:
     """Main automation system"""
@@ -28,16 +32,35 @@ class GoogleFormsAutomationSystem:
         self.scheduler = JobScheduler(self.rabbitmq_handler, timezone)
         self.stats = {'processed': 0, 'succeeded': 0, 'failed': 0}
         self.headless_mode = True
-        self.max_threads = 1
+        self.submit_mode = 'selenium'
+        self.cache_parsed_data = False
+        self.http_concurrency_factor = DEFAULT_HTTP_CONCURRENCY_FACTOR
+        self.set_threading_config(1)
         self._stats_lock = threading.Lock()
         self.job_queue = queue.Queue() # Antrian internal untuk pekerjaan
+        self._driver_pool = queue.Queue()  # Browser Chrome yang siap dipakai ulang
+        self._driver_pool_closed = False
 
     def set_headless_mode(self, headless: bool):
         self.headless_mode = headless
         self.form_automation.set_headless_mode(headless)
     
+    def set_submit_mode(self, mode: str):
+        """Set submit mode: 'selenium' (browser) atau 'http' (POST langsung ke formResponse)"""
+        self.submit_mode = mode
+    
+    def set_parsed_data_cache(self, enabled: bool):
+        """Cache hasil parse file data ke sidecar .parquet (berguna untuk run CLI berulang)"""
+        self.cache_parsed_data = enabled
+    
+    def set_http_concurrency(self, factor: int):
+        """Jumlah POST HTTP paralel per thread pada submit mode 'http'"""
+        self.http_concurrency_factor = max(1, factor)
+        self.form_automation.set_http_pool_size(self.max_threads * self.http_concurrency_factor)
+    
     def set_threading_config(self, max_threads: int):
         self.max_threads = max_threads
+        self.form_automation.set_http_pool_size(max_threads * self.http_concurrency_factor)
     
     def initialize(self, csv_headers: list = None) -> bool:
         try:
@@ -65,19 +88,48 @@ class GoogleFormsAutomationSystem:
             except Exception as e:
                 logger.error(f"Error in Selenium worker thread: {e}")
 
+    def _acquire_driver(self):
+        """Ambil browser dari pool, atau start browser baru jika pool kosong"""
+        try:
+            return self._driver_pool.get_nowait()
+        except queue.Empty:
+            return self.form_automation.setup_driver(headless=self.headless_mode)
+
+    def _release_driver(self, driver):
+        """Kembalikan browser ke pool; browser yang rusak atau pool yang sudah ditutup akan di-quit"""
+        if not self._driver_pool_closed and self.form_automation.is_driver_alive(driver):
+            self._driver_pool.put(driver)
+            return
+        self.form_automation.cleanup_driver(driver)
+
+    def _close_driver_pool(self):
+        """Quit semua browser di pool dan hapus profile sementaranya
+
+        Browser yang masih dipakai worker tidak disentuh; profile-nya dihapus
+        saat browser itu dikembalikan (pool sudah ditutup, jadi langsung di-quit).
+        """
+        self._driver_pool_closed = True
+        while True:
+            try:
+                driver = self._driver_pool.get_nowait()
+            except queue.Empty:
+                break
+            self.form_automation.cleanup_driver(driver)
+
     def process_job(self, job_data: Dict) -> bool:
         """Process single job. (Ini dipanggil oleh _selenium_worker)"""
+        driver = None
         try:
             row_id = job_data.get('row_id')
             form_data = job_data.get('form_data', {})
             
             logger.info(f"🔄 Processing Row {row_id}")
             
-            thread_automation = GoogleFormAutomation(self.form_url, self.form_automation.request_config)
-            thread_automation.set_headless_mode(self.headless_mode)
-            thread_automation.field_types = self.form_automation.field_types
-            thread_automation.entry_fields = self.form_automation.entry_fields
-            success = thread_automation.submit_form(form_data)
+            if self._uses_http_submit():
+                success = self.form_automation.submit_form_http(form_data)
+            else:
+                driver = self._acquire_driver()
+                success = self.form_automation.submit_form(form_data, driver=driver)
             
             self._update_stats(success, row_id)
             return success
@@ -85,49 +137,84 @@ class GoogleFormsAutomationSystem:
             logger.error(f"Job processing error for Row {job_data.get('row_id', '?')}: {e}")
             self._update_stats(False, job_data.get('row_id', '?'))
             return False
+        finally:
+            if driver:
+                self._release_driver(driver)
 
     def _update_stats(self, success: bool, row_id):
+        # Hanya increment counter di dalam lock; logging dilakukan di luar agar thread lain tidak menunggu I/O
+        outcome = 'succeeded' if success else 'failed'
         with self._stats_lock:
             self.stats['processed'] += 1
-            if success:
-                self.stats['succeeded'] += 1
-                logger.info(f"✅ Row {row_id} completed successfully")
-            else:
-                self.stats['failed'] += 1
-                logger.error(f"❌ Row {row_id} failed")
+            self.stats[outcome] += 1
+        
+        if success:
+            logger.info(f"✅ Row {row_id} completed successfully")
+        else:
+            logger.error(f"❌ Row {row_id} failed")
 
-    def run_batch_mode(self, csv_path: str):
-        """Run in batch mode"""
-        logger.info("📦 Running in BATCH mode...")
-        reader = CSVDataReader(csv_path, self.form_url)
-        if not reader.load_data(): return
-        if not self.initialize(reader.headers): return
-        jobs = reader.get_job_list(self.scheduler.timezone.zone)
-        logger.info(f"📋 Processing {len(jobs)} jobs")
+    def run_batch_mode(self, csv_path: str, chunk_size: int = 1000, reader: CSVDataReader = None):
+        """Run in batch mode (job dibuat dan diproses per chunk baris)
 
-        if self.max_threads > 1 and len(jobs) > 1:
-            logger.info(f"🧵 Using {self.max_threads} concurrent threads")
-            self._process_jobs_threaded(jobs)
+        reader: CSVDataReader yang sudah di-load (opsional) agar file tidak di-parse ulang
+        """
+        logger.info("📦 Running in BATCH mode...")
+        if reader is None:
+            reader = CSVDataReader(csv_path, self.form_url, self.cache_parsed_data)
+            # CSV di-stream per chunk (kecuali cache parse aktif); Excel tetap dibaca penuh
+            if not reader.load_data(stream=True): return
+        if not self.initialize(reader.entry_columns): return
+        if reader.streaming:
+            logger.info(f"📋 Processing jobs in chunks of {chunk_size} rows (streaming CSV)")
         else:
-            for job in jobs: self.process_job(job)
+            logger.info(f"📋 Processing {len(reader.df)} jobs")
+        workers = self._batch_worker_count()
+        if workers > 1:
+            logger.info(f"🧵 Using {workers} concurrent threads")
+
+        try:
+            for jobs in reader.iter_job_chunks(self.scheduler.timezone.zone, chunk_size):
+                if workers > 1 and len(jobs) > 1:
+                    self._process_jobs_threaded(jobs)
+                else:
+                    for job in jobs: self.process_job(job)
+        except Exception as e:
+            # Saat streaming, error parse di chunk berikutnya baru muncul di sini
+            logger.error(f"Error reading data file: {e}")
         self.print_stats()
 
+    def _uses_http_submit(self) -> bool:
+        return self.submit_mode == 'http' and self.form_automation.supports_http_submit()
+
+    def _batch_worker_count(self) -> int:
+        """Jumlah worker batch: POST HTTP murah (I/O bound), browser Chrome mahal"""
+        if self._uses_http_submit():
+            return self.max_threads * self.http_concurrency_factor
+        return self.max_threads
+
     def _process_jobs_threaded(self, jobs):
         """Process jobs using ThreadPoolExecutor"""
-        with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
+        http_mode = self._uses_http_submit()
+        with ThreadPoolExecutor(max_workers=self._batch_worker_count()) as executor:
             future_to_job = {executor.submit(self.process_job, job): job for job in jobs}
             for future in as_completed(future_to_job):
                 job = future_to_job[future]
                 try: future.result()
                 except Exception as exc: logger.error(f"Thread execution error for job {job.get('row_id', '?')}: {exc}")
-                time.sleep(0.5)
+                # Jeda hanya untuk mode browser; submit HTTP tidak perlu di-throttle per hasil
+                if not http_mode:
+                    time.sleep(0.5)
+
+    def run_scheduled_mode(self, csv_path: str, reader: CSVDataReader = None):
+        """Run in scheduled mode
 
-    def run_scheduled_mode(self, csv_path: str):
-        """Run in scheduled mode"""
+        reader: CSVDataReader yang sudah di-load (opsional) agar file tidak di-parse ulang
+        """
         logger.info("⏰ Running in SCHEDULED mode...")
-        reader = CSVDataReader(csv_path, self.form_url)
-        if not reader.load_data(): return
-        if not self.initialize(reader.headers): return
+        if reader is None:
+            reader = CSVDataReader(csv_path, self.form_url, self.cache_parsed_data)
+            if not reader.load_data(): return
+        if not self.initialize(reader.entry_columns): return
         jobs = reader.get_job_list(self.scheduler.timezone.zone)
         logger.info(f"📋 Scheduling {len(jobs)} jobs")
         logger.info("🧹 Clearing existing jobs from queue...")
@@ -178,5 +265,7 @@ class GoogleFormsAutomationSystem:
     
     def cleanup(self):
         """Cleanup resources"""
+        self._close_driver_pool()
+        self.form_automation.close_session()
         self.rabbitmq_handler.disconnect()
         self.print_stats()
\ No newline at end of file
@@ -2,29 +2,151 @@
 CSV data reader module for form data
 """
 
+import csv
 import logging
 import os
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
+import numpy as np
 import pandas as pd
 import pytz
+from ..utils.helpers import read_data_file
 from ..utils.url_parser import extract_entry_order_from_url
 
 logger = logging.getLogger(__name__)
 
+# Format ETA yang dicoba berurutan (didefinisikan sekali, bukan per baris)
+ETA_FORMATS = (
+    '%Y-%m-%d %H:%M:%S',    # 2025-08-23 17:40:00
+    '%Y-%m-%d %H:%M',       # 2025-08-23 17:40
+    '%Y-%m-%d',             # 2025-08-23
+    '%d/%m/%Y %H:%M:%S',    # 23/08/2025 17:40:00
+    '%d/%m/%Y %H:%M',       # 23/08/2025 17:40
+    '%d/%m/%Y',             # 23/08/2025
+    '%m/%d/%Y %H:%M:%S',    # 8/23/2025 17:40:00 (American format)
+    '%m/%d/%Y %H:%M',       # 8/23/2025 17:40 (American format)
+    '%m/%d/%Y',             # 8/23/2025 (American format)
+    '%d-%m-%Y %H:%M:%S',    # 23-08-2025 17:40:00
+    '%d-%m-%Y %H:%M',       # 23-08-2025 17:40
+    '%d-%m-%Y'              # 23-08-2025
+)
+
+
+def _column_values(series: pd.Series) -> list:
+    """Kolom -> list nilai Python (None untuk NA)
+
+    Kolom float yang semua nilainya bulat (mis. 9.0 dari kolom angka dengan sel
+    kosong) dikonversi ke integer sekali per kolom, sehingga tiap sel tidak perlu
+    diformat sebagai float lalu di-parse ulang untuk membuang '.0'.
+    """
+    if pd.api.types.is_float_dtype(series.dtype):
+        present = series.dropna().to_numpy(dtype='float64')
+        # Batas 1e16: di atas itu str(float) memakai notasi eksponen dan tidak dibulatkan
+        if len(present) and ((present % 1 == 0) & (np.abs(present) < 1e16)).all():
+            series = series.astype('Int64')
+    return series.to_numpy(dtype=object, na_value=None).tolist()
+
+
+def _column_strings(series: pd.Series, strip: bool = False) -> list:
+    """Kolom -> list str(nilai) (None untuk NA), distringify sekali per kolom"""
+    values = series.to_numpy(dtype=object, na_value=None)
+    # astype(str) pada object array memanggil str() per elemen di C (hasil sama dengan str(v))
+    strings = values.astype(str)
+    if strip:
+        strings = np.char.strip(strings)
+    return [None if missing else text for missing, text in zip(pd.isna(values).tolist(), strings.tolist())]
+
+
+def _clean_value(value) -> Optional[str]:
+    """Bersihkan nilai sel seperti selenium_debug.py; None jika kosong
+
+    Sel NaN/NA sudah diganti None oleh mask per blok (to_numpy(na_value=None)),
+    jadi di sini cukup cek identitas tanpa probe NaN per sel.
+    """
+    if value is None:
+        return None
+    
+    # Clean value: normalize multiple spaces to single space (split() sudah membuang spasi tepi)
+    cleaned_value = ' '.join(str(value).split())
+    if not cleaned_value:
+        return None
+    
+    # Remove .0 from float numbers (e.g., 9.0 -> 9, but keep 9.5 as 9.5)
+    try:
+        # Check if it's a number that ends with .0
+        if '.' in cleaned_value and cleaned_value.replace('.', '').replace('-', '').isdigit():
+            float_val = float(cleaned_value)
+            if float_val.is_integer():
+                cleaned_value = str(int(float_val))
+    except ValueError:
+        # Not a number, keep as is
+        pass
+    
+    return cleaned_value
+
+
+
+def _make_form_data_builder(entry_keys: List[str]):
+    """Buat fungsi baris->form_data yang dispesialisasi untuk satu skema kolom
+
+    Key dan fungsi pembersih diikat sekali di closure, dan form_data dibangun
+    dengan satu dict comprehension tanpa dict perantara per baris.
+    """
+    keys = tuple(entry_keys)
+    clean = _clean_value
+    
+    def build_form_data(row) -> Dict[str, str]:
+        return {
+            entry_key: cleaned_value
+            for entry_key, value in zip(keys, row)
+            if (cleaned_value := clean(value)) is not None
+        }
+    
+    return build_form_data
+
 
 class CSVDataReader:
     """CSV data reader for form data"""
     
-    def __init__(self, file_path: str, form_url: str = None):
+    def __init__(self, file_path: str, form_url: str = None, cache_parsed: bool = False):
         self.file_path = file_path
         self.form_url = form_url
+        self.cache_parsed = cache_parsed  # Simpan hasil parse ke sidecar .parquet untuk run berikutnya (menonaktifkan streaming)
         self.df = None
         self.headers = []
+        self.entry_columns = []  # Header entry.* (dihitung sekali di load_data)
         self.entry_order = []  # Entry IDs in URL order
+        self.streaming = False  # True jika CSV dibaca per chunk di iter_job_chunks (df hanya baris contoh)
+        self._stream_kwargs = {}
     
-    def load_data(self) -> bool:
-        """Load data from CSV file"""
+    def _read_file(self, file_ext: str, **kwargs) -> pd.DataFrame:
+        """Read data file, reusing the parquet sidecar cache if it is newer than the source"""
+        if not self.cache_parsed or 'nrows' in kwargs:
+            return read_data_file(self.file_path, file_ext, **kwargs)
+        
+        cache_path = self.file_path + '.cache.parquet'
+        try:
+            if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(self.file_path):
+                logger.info(f"⚡ Using parsed cache: {cache_path}")
+                return pd.read_parquet(cache_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable parse cache {cache_path}: {e}")
+        
+        df = read_data_file(self.file_path, file_ext, **kwargs)
+        try:
+            # Parquet hanya menerima nama kolom string (header=None menghasilkan 0, 1, 2, ...)
+            df.set_axis([str(c) for c in df.columns], axis=1).to_parquet(cache_path, compression='zstd')
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write parse cache {cache_path}: {e}")
+        return df
+    
+    def load_data(self, stream: bool = False) -> bool:
+        """Load data from CSV file
+
+        Dengan stream=True, CSV hanya dibaca baris pertamanya untuk mapping kolom;
+        seluruh baris dibaca per chunk oleh iter_job_chunks. Jika cache_parsed
+        aktif, CSV tetap dibaca penuh supaya sidecar .parquet bisa ditulis/dipakai.
+        """
         try:
             file_ext = os.path.splitext(self.file_path)[1].lower()
             
@@ -34,6 +156,9 @@ class CSVDataReader:
                 logger.info(f"📋 Entry order from URL: {len(self.entry_order)} entries")
             
             if file_ext == '.csv':
+                self.streaming = stream and not self.cache_parsed
+                read_kwargs = {'nrows': 1} if self.streaming else {}
+                
                 # Check if CSV has headers by examining first line
                 with open(self.file_path, 'r') as f:
                     first_line = f.readline().strip()
@@ -42,9 +167,16 @@ class CSVDataReader:
                 has_headers = first_line.startswith('entry.')
                 
                 if has_headers:
-                    self.df = pd.read_csv(self.file_path)
+                    # Hanya kolom entry.*, eta, priority yang dipakai; kolom lain tidak perlu di-parse
+                    columns = next(csv.reader([first_line]))
+                    wanted = [c for c in columns if c.startswith('entry.') or c in ('eta', 'priority')]
+                    if len(wanted) < len(columns):
+                        self.df = self._read_file(file_ext, usecols=wanted, **read_kwargs)
+                    else:
+                        self.df = self._read_file(file_ext, **read_kwargs)
                     self.headers = list(self.df.columns)
-                    logger.info(f"✅ CSV with headers: {len(self.df)} rows")
+                    self._stream_kwargs = {'usecols': self.headers}
+                    logger.info(f"✅ CSV with headers: {'streaming' if self.streaming else f'{len(self.df)} rows'}")
                 else:
                     # CSV without headers - trust URL order + eta, priority at end
                     if not self.entry_order:
@@ -54,7 +186,7 @@ class CSVDataReader:
                     # Create headers from URL order + eta, priority
                     expected_headers = self.entry_order + ['eta', 'priority']
                     
-                    self.df = pd.read_csv(self.file_path, header=None)
+                    self.df = self._read_file(file_ext, header=None, **read_kwargs)
                     
                     # Validate minimum columns (must have at least 3: some entries + eta + priority)
                     if len(self.df.columns) < 3:
@@ -79,7 +211,8 @@ class CSVDataReader:
                         self.headers = headers
                         logger.warning(f"⚠️ Using first {entry_cols} entries from URL order")
                     
-                    logger.info(f"✅ CSV without headers: {len(self.df)} rows, {len(self.headers)} columns")
+                    self._stream_kwargs = {'header': None, 'names': self.headers}
+                    logger.info(f"✅ CSV without headers: {'streaming' if self.streaming else f'{len(self.df)} rows'}, {len(self.headers)} columns")
                     
             elif file_ext in ['.xlsx', '.xls']:
                 # Excel files have NO HEADERS - all rows are data
@@ -89,7 +222,7 @@ class CSVDataReader:
                     return False
                 
                 # Read Excel without headers (header=None)
-                self.df = pd.read_excel(self.file_path, header=None)
+                self.df = self._read_file(file_ext, header=None)
                 
                 # Map columns to entry order (skip last 2 columns which are eta, priority)
                 num_cols = len(self.df.columns)
@@ -127,6 +260,8 @@ class CSVDataReader:
                 logger.error(f"Unsupported file format: {file_ext}")
                 return False
             
+            self.entry_columns = [h for h in self.headers if h.startswith('entry.')]
+            
             logger.info(f"📊 Headers: {self.headers[:5]}..." if len(self.headers) > 5 else f"📊 Headers: {self.headers}")
             return True
         except Exception as e:
@@ -138,48 +273,63 @@ class CSVDataReader:
         if self.df is None:
             return []
         
-        jobs = []
+        jobs = self._build_jobs(self.df, pytz.timezone(timezone_str))
+        logger.info(f"📊 Created {len(jobs)} jobs from Excel data (selenium_debug.py logic)")
+        return jobs
+    
+    def iter_job_chunks(self, timezone_str: str = 'Asia/Jakarta', chunk_size: int = 1000) -> Iterator[List[Dict]]:
+        """Yield job list per chunk baris agar job dict tidak dibuat sekaligus untuk file besar"""
+        if self.df is None:
+            return
+        
         timezone = pytz.timezone(timezone_str)
+        chunk_size = max(int(chunk_size), 1)
+        
+        if self.streaming:
+            # Baca dan bangun job per chunk: DataFrame penuh tidak pernah ada di memori
+            for chunk in pd.read_csv(self.file_path, chunksize=chunk_size, **self._stream_kwargs):
+                yield self._build_jobs(chunk, timezone)
+            return
+        
+        for start in range(0, len(self.df), chunk_size):
+            yield self._build_jobs(self.df.iloc[start:start + chunk_size], timezone)
+    
+    def iter_jobs(self, timezone_str: str = 'Asia/Jakarta', chunk_size: int = 1000) -> Iterator[Dict]:
+        """Yield job satu per satu (lazy); berguna jika hasil hanya diiterasi sekali"""
+        for jobs in self.iter_job_chunks(timezone_str, chunk_size):
+            yield from jobs
+    
+    def _build_jobs(self, df: pd.DataFrame, timezone) -> List[Dict]:
+        """Build job dicts from DataFrame rows (row_id tetap dari index asli)"""
+        jobs = []
+        
+        # Entry keys yang dipetakan ke kolom data (kolom terakhir: eta, priority), dihitung sekali
+        entry_keys = self.entry_order[:max(len(df.columns) - 2, 0)]
         
-        # Process each row like selenium_debug.py does
-        for index, row in self.df.iterrows():
-            # Convert row to list (like selenium_debug.py: first_row = df.iloc[0].tolist())
-            row_data = row.tolist()
+        # Ambil data per kolom sekaligus (C-level) lalu gabungkan per baris dengan zip,
+        # bukan akses sel satu per satu di dalam loop baris
+        if entry_keys:
+            # Konversi per kolom ke list Python; NaN/NA (termasuk mask kolom Arrow) langsung jadi None
+            entry_df = df.iloc[:, :len(entry_keys)]
+            rows = list(zip(*(_column_values(entry_df.iloc[:, i]) for i in range(len(entry_keys)))))
+        else:
+            rows = [()] * len(df)
+        build_form_data = _make_form_data_builder(entry_keys)
+        
+        # Get eta and priority from last 2 columns (missing -> None)
+        if len(df.columns) >= 2:
+            eta_strs = _column_strings(df.iloc[:, -2], strip=True)
+            priorities = _column_strings(df.iloc[:, -1])
+        else:
+            eta_strs = priorities = [None] * len(df)
+        
+        for index, row, eta_str, priority_value in zip(df.index.tolist(), rows, eta_strs, priorities):
             
             # Map Excel data to entry fields with cleaning (exactly like selenium_debug.py)
-            form_data = {}
-            for i, entry_key in enumerate(self.entry_order):
-                if i < len(row_data) - 2:  # Skip eta and priority columns (last 2)
-                    value = row_data[i]
-                    if pd.notna(value) and str(value).strip():
-                        # Clean value: normalize multiple spaces to single space and strip
-                        cleaned_value = ' '.join(str(value).strip().split())
-                        
-                        # Remove .0 from float numbers (e.g., 9.0 -> 9, but keep 9.5 as 9.5)
-                        try:
-                            # Check if it's a number that ends with .0
-                            if '.' in cleaned_value and cleaned_value.replace('.', '').replace('-', '').isdigit():
-                                float_val = float(cleaned_value)
-                                if float_val.is_integer():
-                                    cleaned_value = str(int(float_val))
-                        except ValueError:
-                            # Not a number, keep as is
-                            pass
-                        
-                        form_data[entry_key] = cleaned_value
-            
-            # Get eta and priority from last 2 columns
-            eta_value = None
-            priority_value = 'normal'
+            form_data = build_form_data(row)
             
-            if len(row_data) >= 2:
-                # Second to last column is eta
-                if len(row_data) >= 2 and pd.notna(row_data[-2]):
-                    eta_value = row_data[-2]
-                
-                # Last column is priority
-                if len(row_data) >= 1 and pd.notna(row_data[-1]):
-                    priority_value = str(row_data[-1])
+            if priority_value is None:
+                priority_value = 'normal'
             
             # Job info
             job = {
@@ -190,53 +340,35 @@ class CSVDataReader:
             }
             
             # Handle ETA
-            if eta_value is not None:
+            if eta_str is not None:
                 try:
-                    eta_str = str(eta_value).strip()
-                    
                     # Skip numeric-only values that aren't timestamps
                     if eta_str.isdigit() and len(eta_str) < 8:
-                        logger.debug(f"Row {job['row_id']}: Skipping numeric ETA value: {eta_str}")
+                        logger.debug("Row %s: Skipping numeric ETA value: %s", job['row_id'], eta_str)
                         job['eta'] = None
                     elif eta_str.lower() in ['', 'nan', 'none', 'null']:
                         # Skip empty/null values
                         job['eta'] = None
                     else:
                         # Try different datetime formats (all will be interpreted as WIB timezone)
-                        formats = [
-                            '%Y-%m-%d %H:%M:%S',    # 2025-08-23 17:40:00
-                            '%Y-%m-%d %H:%M',       # 2025-08-23 17:40
-                            '%Y-%m-%d',             # 2025-08-23
-                            '%d/%m/%Y %H:%M:%S',    # 23/08/2025 17:40:00
-                            '%d/%m/%Y %H:%M',       # 23/08/2025 17:40
-                            '%d/%m/%Y',             # 23/08/2025
-                            '%m/%d/%Y %H:%M:%S',    # 8/23/2025 17:40:00 (American format)
-                            '%m/%d/%Y %H:%M',       # 8/23/2025 17:40 (American format) 
-                            '%m/%d/%Y',             # 8/23/2025 (American format)
-                            '%d-%m-%Y %H:%M:%S',    # 23-08-2025 17:40:00
-                            '%d-%m-%Y %H:%M',       # 23-08-2025 17:40
-                            '%d-%m-%Y'              # 23-08-2025
-                        ]
-                        
-                        for fmt in formats:
+                        for fmt in ETA_FORMATS:
                             try:
                                 naive_dt = datetime.strptime(eta_str, fmt)
                                 # Always localize to WIB timezone (Asia/Jakarta)
                                 eta_dt = timezone.localize(naive_dt)
                                 job['eta'] = eta_dt
-                                logger.info(f"Row {job['row_id']}: Parsed ETA as WIB: {eta_dt.strftime('%Y-%m-%d %H:%M:%S %Z')} (format: {fmt})")
+                                logger.debug("Row %s: Parsed ETA as WIB: %s (format: %s)", job['row_id'], eta_dt, fmt)
                                 break
                             except ValueError:
                                 continue
                         
                         if job['eta'] is None:
-                            logger.debug(f"Row {job['row_id']}: Could not parse ETA format: '{eta_str}' - using immediate execution")
+                            logger.debug("Row %s: Could not parse ETA format: '%s' - using immediate execution", job['row_id'], eta_str)
                 except Exception as e:
-                    logger.debug(f"Row {job['row_id']}: ETA processing error: {e}")
+                    logger.debug("Row %s: ETA processing error: %s", job['row_id'], e)
             
             jobs.append(job)
             
-            logger.debug(f"Row {index + 1}: Mapped {len(form_data)} fields from Excel data")
+            logger.debug("Row %d: Mapped %d fields from Excel data", index + 1, len(form_data))
         
-        logger.info(f"📊 Created {len(jobs)} jobs from Excel data (selenium_debug.py logic)")
         return jobs
\ No newline at end of file
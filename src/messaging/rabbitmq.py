@@ -19,6 +19,7 @@ class RabbitMQHandler:
 
     def __init__(self, config: Dict = None):
         self.config = config or {}
+        self.queue_name = self.config.get("queue_name", "google_forms_jobs")
         self.connection = None
         self.channel = None
         self.consuming = False
@@ -63,7 +64,7 @@ class RabbitMQHandler:
                 self.connection = pika.BlockingConnection(parameters)
                 self.channel = self.connection.channel()
 
-                queue_name = self.config.get("queue_name", "google_forms_jobs")
+                queue_name = self.queue_name
 
                 # Declare queue with conflict handling
                 try:
@@ -146,7 +147,7 @@ class RabbitMQHandler:
             try:
                 # This will raise an exception if connection is broken
                 self.channel.queue_declare(
-                    queue=self.config.get("queue_name", "google_forms_jobs"),
+                    queue=self.queue_name,
                     passive=True,
                 )
                 return True
@@ -168,7 +169,7 @@ class RabbitMQHandler:
 
             # Ensure the queue exists
             channel.queue_declare(
-                queue=self.config.get("queue_name", "google_forms_jobs"), durable=True
+                queue=self.queue_name, durable=True
             )
 
             serializable_data = self._make_serializable(job_data)
@@ -176,7 +177,7 @@ class RabbitMQHandler:
 
             channel.basic_publish(
                 exchange="",
-                routing_key=self.config.get("queue_name", "google_forms_jobs"),
+                routing_key=self.queue_name,
                 body=message,
                 properties=pika.BasicProperties(delivery_mode=2),
             )
@@ -202,7 +203,7 @@ class RabbitMQHandler:
 
                 self.channel.basic_publish(
                     exchange="",
-                    routing_key=self.config.get("queue_name", "google_forms_jobs"),
+                    routing_key=self.queue_name,
                     body=message,
                     properties=pika.BasicProperties(
                         delivery_mode=2,  # Make message persistent
@@ -264,7 +265,7 @@ class RabbitMQHandler:
 
                 self.channel.basic_qos(prefetch_count=prefetch_count)
                 self.channel.basic_consume(
-                    queue=self.config.get("queue_name", "google_forms_jobs"),
+                    queue=self.queue_name,
                     on_message_callback=wrapper,
                 )
 
@@ -305,7 +306,7 @@ class RabbitMQHandler:
             if not self.ensure_connection():
                 return False
 
-            queue_name = self.config.get("queue_name", "google_forms_jobs")
+            queue_name = self.queue_name
             result = self.channel.queue_purge(queue=queue_name)
             logger.info(
                 f"🧹 Purged {result.method.message_count} messages from queue '{queue_name}'"
@@ -321,7 +322,7 @@ class RabbitMQHandler:
             if not self.ensure_connection():
                 return {}
 
-            queue_name = self.config.get("queue_name", "google_forms_jobs")
+            queue_name = self.queue_name
             method = self.channel.queue_declare(queue=queue_name, passive=True)
 
             return {
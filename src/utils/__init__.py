@@ -2,6 +2,6 @@
 Utility modules
 """
 
-from .helpers import create_sample_csv
+from .helpers import create_sample_csv, read_data_file
 
-__all__ = ['create_sample_csv']
\ No newline at end of file
+__all__ = ['create_sample_csv', 'read_data_file']
\ No newline at end of file
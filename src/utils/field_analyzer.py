@@ -3,12 +3,27 @@ Field analyzer untuk menganalisis input types dari URL prefilled
 """
 
 import logging
-from urllib.parse import urlparse, parse_qs
-from typing import Dict, List, Set
-from collections import Counter
+import os
+import pickle
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from urllib.parse import urlsplit, parse_qsl
+from typing import Dict, List, Mapping, Set
+from collections import Counter, defaultdict
 
 logger = logging.getLogger(__name__)
 
+# Jawaban ya/tidak yang menandakan pilihan tunggal (radio)
+YES_NO_VALUES = frozenset({'ya', 'tidak', 'yes', 'no'})
+
+# Kode integer untuk setiap field type pada field_types.py hasil generate
+FIELD_TYPE_CODES = {'radio': 0, 'text': 1, 'number': 2, 'select': 3, 'checkbox': 4}
+
+# Protocol pickle sidecar dikunci agar tetap terbaca setelah upgrade Python
+# (format marshal tidak dijamin stabil antar versi interpreter)
+FIELD_TYPES_PICKLE_PROTOCOL = 4
+
 class FormFieldAnalyzer:
     """Class untuk menganalisis Google Form fields secara dinamis"""
     
@@ -16,42 +31,51 @@ class FormFieldAnalyzer:
         """Initialize field analyzer"""
         pass
     
-    def analyze_field_types_from_url(self, form_url: str) -> Dict[str, Dict]:
-        """Analyze field types from prefilled URL - instance method"""
+    def analyze_field_types_from_url(self, form_url: str) -> Mapping[str, Mapping]:
+        """Analyze field types from prefilled URL - instance method
+
+        Hasilnya di-cache per URL dan dibagi antar caller: mapping read-only
+        (termasuk nilai per field), salin dengan dict() jika perlu diubah.
+        """
         return analyze_field_types_from_url(form_url)
     
-    def generate_field_types_config(self, form_url: str) -> Dict[str, Dict]:
+    def generate_field_types_config(self, form_url: str) -> Mapping[str, Mapping]:
         """Generate field types configuration untuk URL tertentu"""
         return self.analyze_field_types_from_url(form_url)
 
 
-def analyze_field_types_from_url(form_url: str) -> Dict[str, Dict]:
-    """Analyze field types from prefilled URL"""
+@lru_cache(maxsize=128)
+def analyze_field_types_from_url(form_url: str) -> Mapping[str, Mapping]:
+    """Analyze field types from prefilled URL
+
+    The result only depends on the URL, so it is memoized per URL and shared
+    between callers; it is returned as read-only mappings so no caller can
+    mutate the cached copy.
+    """
     try:
-        # Parse URL to get query parameters
-        parsed_url = urlparse(form_url)
-        params = parse_qs(parsed_url.query)
-        
-        field_info = {}
+        # Parse URL query once, grouping repeated (checkbox) values per parameter
+        params = defaultdict(list)
         entry_counts = Counter()
         
-        # Count occurrences of each entry ID
-        for param_name in params.keys():
+        for param_name, value in parse_qsl(urlsplit(form_url).query):
             if param_name.startswith('entry.'):
-                base_entry = param_name.split('.')[0] + '.' + param_name.split('.')[1]
-                entry_counts[base_entry] += len(params[param_name])
+                params[param_name].append(value)
+                # Count occurrences of each base entry ID (entry.XXX)
+                entry_counts['.'.join(param_name.split('.', 2)[:2])] += 1
+        
+        field_info = {}
         
         # Analyze each entry
         for param_name, values in params.items():
-            if param_name.startswith('entry.') and not param_name.endswith('.other_option_response'):
-                base_entry = param_name.split('.')[0] + '.' + param_name.split('.')[1]
+            if not param_name.endswith('.other_option_response'):
+                base_entry = '.'.join(param_name.split('.', 2)[:2])
                 
                 if base_entry not in field_info:
                     field_info[base_entry] = {
                         'type': 'text',  # default
                         'has_other_option': False,
                         'multiple_values': False,
-                        'sample_values': []
+                        'sample_values': ()
                     }
                 
                 # Check if it's multiple choice (checkbox/multi-select)
@@ -63,34 +87,59 @@ def analyze_field_types_from_url(form_url: str) -> Dict[str, Dict]:
                 if '__other_option__' in values:
                     field_info[base_entry]['has_other_option'] = True
                 
-                # Store sample values (exclude __other_option__)
-                sample_values = [v for v in values if v != '__other_option__']
+                # Store sample values (exclude __other_option__); label yang sama
+                # di banyak field (mis. skala likert) di-intern jadi satu object
+                sample_values = tuple(sys.intern(v) for v in values if v != '__other_option__')
                 field_info[base_entry]['sample_values'] = sample_values
                 
-                # Determine type based on sample values
-                if len(sample_values) > 0:
+                # Determine type based on sample values; entry yang berulang tetap
+                # 'checkbox' meskipun nilainya angka atau 'text'
+                if len(sample_values) > 0 and not field_info[base_entry]['multiple_values']:
                     sample_val = sample_values[0].lower()
-                    if sample_val in ['ya', 'tidak', 'yes', 'no']:
-                        if not field_info[base_entry]['multiple_values']:
-                            field_info[base_entry]['type'] = 'radio'
+                    if sample_val in YES_NO_VALUES:
+                        field_info[base_entry]['type'] = 'radio'
                     elif sample_val == 'text':
                         field_info[base_entry]['type'] = 'text'
                     elif sample_val.isdigit():
                         field_info[base_entry]['type'] = 'number'
-                    elif len(sample_values) == 1 and not field_info[base_entry]['multiple_values']:
+                    elif len(sample_values) == 1:
                         # Single selection dropdown
                         field_info[base_entry]['type'] = 'select'
         
         logger.info(f"✅ Analyzed {len(field_info)} field types from URL")
-        return field_info
+        # Field dengan info identik berbagi satu object (hash-consing)
+        canonical = {}
+        frozen = {}
+        for entry, info in field_info.items():
+            key = (info['type'], info['has_other_option'], info['multiple_values'], info['sample_values'])
+            frozen[entry] = canonical.setdefault(key, MappingProxyType(info))
+        return MappingProxyType(frozen)
         
     except Exception as e:
         logger.error(f"Error analyzing field types: {e}")
-        return {}
+        return MappingProxyType({})
+
+
+@lru_cache(maxsize=128)
+def fields_by_type(form_url: str) -> Mapping[str, frozenset]:
+    """Entry ids grouped per field type, computed once per URL"""
+    buckets = defaultdict(set)
+    for entry, info in analyze_field_types_from_url(form_url).items():
+        buckets[info['type']].add(entry)
+    return MappingProxyType({field_type: frozenset(entries) for field_type, entries in buckets.items()})
+
+
+@lru_cache(maxsize=128)
+def fields_with_other_option(form_url: str) -> frozenset:
+    """Entry ids that offer an 'Other' free-text option, computed once per URL"""
+    return frozenset(
+        entry for entry, info in analyze_field_types_from_url(form_url).items()
+        if info['has_other_option']
+    )
 
 
 def generate_prefilled_url_with_types(base_form_url: str, entry_order: List[str], 
-                                     form_data: dict, field_types: Dict[str, Dict]) -> str:
+                                     form_data: dict, field_types: Mapping[str, Mapping]) -> str:
     """Generate prefilled URL with proper handling of different field types"""
     try:
         import urllib.parse
@@ -146,28 +195,179 @@ def generate_prefilled_url_with_types(base_form_url: str, entry_order: List[str]
         return base_form_url
 
 
-def save_field_types_to_config(field_types: Dict[str, Dict], config_path: str = "field_types.py"):
-    """Save analyzed field types to a config file"""
+def save_field_types_to_config(field_types: Mapping[str, Mapping], config_path: str = "field_types.py"):
+    """Save analyzed field types to a config file
+
+    Tabel ditulis sebagai kolom paralel (SoA): ``FIELD_INDEX`` memetakan
+    entry id ke posisi, lalu setiap atribut disimpan dalam satu tuple/bitmask.
+    Kolom ``TYPES`` berisi kode ``FType`` (lihat ``FIELD_TYPE_CODES``).
+    Datanya disimpan di sidecar ``.pickle`` di samping file config dan baru
+    di-load saat pertama kali dipakai.
+    """
     try:
+        # multiple_values tidak disimpan tapi diturunkan dari type == 'checkbox'
+        # (analyzer selalu konsisten; input yang tidak konsisten ditolak)
+        for entry_id, info in field_types.items():
+            if (info["type"] == 'checkbox') != info["multiple_values"]:
+                raise ValueError(f"{entry_id}: multiple_values tidak sesuai dengan type {info['type']!r}")
+        
+        field_index = {entry_id: i for i, entry_id in enumerate(field_types)}
+        types = bytes(FIELD_TYPE_CODES[info["type"]] for info in field_types.values())
+        # sample_values yang sama hanya disimpan sekali di pool, per field cukup indeksnya
+        samples_pool = {}
+        samples_index = tuple(
+            samples_pool.setdefault(tuple(info["sample_values"]), len(samples_pool))
+            for info in field_types.values()
+        )
+        # Setiap string sample juga hanya ditulis sekali (dictionary encoding)
+        string_dict = {}
+        samples_codes = tuple(
+            tuple(string_dict.setdefault(value, len(string_dict)) for value in sample)
+            for sample in samples_pool
+        )
+        # Satu byte flag per field: bit0 = has_other_option
+        flags = bytes(
+            1 if info["has_other_option"] else 0
+            for info in field_types.values()
+        )
+        # Daftar entry per type dihitung sekali di sini, bukan di setiap proses
+        ids_by_type = tuple(
+            frozenset(entry_id for entry_id, info in field_types.items() if info["type"] == type_name)
+            for type_name in FIELD_TYPE_CODES
+        )
+        other_option_ids = frozenset(
+            entry_id for entry_id, info in field_types.items() if info["has_other_option"]
+        )
+        
+        sidecar_path = os.path.splitext(config_path)[0] + '.pickle'
+        with open(sidecar_path, 'wb') as f:
+            pickle.dump({
+                'field_index': field_index,
+                'types': types,
+                'flags': flags,
+                'string_dict': tuple(string_dict),
+                'samples_codes': samples_codes,
+                'samples_index': samples_index,
+                'ids_by_type': ids_by_type,
+                'other_option_ids': other_option_ids,
+            }, f, protocol=FIELD_TYPES_PICKLE_PROTOCOL)
+        
         with open(config_path, 'w') as f:
             f.write('"""\n')
             f.write('Auto-generated field types configuration\n')
             f.write('"""\n\n')
-            f.write('FIELD_TYPES = {\n')
-            
-            for entry_id, info in field_types.items():
-                f.write(f'    "{entry_id}": {{\n')
-                f.write(f'        "type": "{info["type"]}",\n')
-                f.write(f'        "multiple_values": {info["multiple_values"]},\n')
-                f.write(f'        "has_other_option": {info["has_other_option"]},\n')
-                f.write(f'        "sample_values": {info["sample_values"]}\n')
-                f.write('    },\n')
-            
-            f.write('}\n')
+            f.write('import pickle\n')
+            f.write('import sys\n')
+            f.write('from array import array\n')
+            f.write('from collections import namedtuple\n')
+            f.write('from enum import IntEnum\n')
+            f.write('from functools import cache\n')
+            f.write('from pathlib import Path\n')
+            f.write('from types import MappingProxyType\n\n\n')
+            f.write('class FType(IntEnum):\n')
+            for type_name, code in FIELD_TYPE_CODES.items():
+                f.write(f'    {type_name.upper()} = {code}\n')
+            f.write('\n\n')
+            f.write("FieldSpec = namedtuple('FieldSpec', 'type multiple_values has_other_option sample_values')\n")
+            f.write('FLAG_HAS_OTHER = 1\n\n')
+            f.write("_Table = namedtuple('_Table', 'field_index types flags samples_pool samples_index "
+                    "ids_by_type other_option_ids')\n\n")
+            f.write(f"_SIDECAR = Path(__file__).with_name({os.path.basename(sidecar_path)!r})\n")
+            f.write(_FIELD_TYPES_ACCESSORS)
         
         logger.info(f"✅ Field types saved to {config_path}")
         return True
         
     except Exception as e:
         logger.error(f"Error saving field types: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+# Helper yang ikut ditulis ke file hasil generate
+_FIELD_TYPES_ACCESSORS = '''
+
+@cache
+def _load():
+    """Load the column table from the sidecar once"""
+    data = pickle.loads(_SIDECAR.read_bytes())
+    # Decode the pool against string_dict so equal labels share one interned str
+    string_dict = tuple(map(sys.intern, data['string_dict']))
+    samples_pool = tuple(tuple(string_dict[j] for j in codes) for codes in data['samples_codes'])
+    return _Table(
+        data['field_index'],
+        array('B', data['types']),
+        data['flags'],
+        samples_pool,
+        array('H', data['samples_index']),
+        data['ids_by_type'],
+        data['other_option_ids'],
+    )
+
+
+def fields_of_type(field_type):
+    """Return the frozenset of entry ids with the given FType"""
+    return _load().ids_by_type[field_type]
+
+
+def fields_with_other_option():
+    """Return the frozenset of entry ids that have an 'other' option"""
+    return _load().other_option_ids
+
+
+def is_multi(entry_id):
+    """Checkbox fields are the only ones that take multiple values"""
+    table = _load()
+    return table.types[table.field_index[entry_id]] == FType.CHECKBOX
+
+
+def samples_for(entry_id):
+    """Return the sample values tuple for an entry id"""
+    table = _load()
+    return table.samples_pool[table.samples_index[table.field_index[entry_id]]]
+
+
+def get_field(entry_id):
+    """Return the FieldSpec record for an entry id"""
+    table = _load()
+    i = table.field_index[entry_id]
+    return FieldSpec(
+        FType(table.types[i]),
+        table.types[i] == FType.CHECKBOX,
+        bool(table.flags[i] & FLAG_HAS_OTHER),
+        table.samples_pool[table.samples_index[i]],
+    )
+
+
+@cache
+def all_fields():
+    """Read-only FIELD_TYPES mapping: entry id -> frozen dict with a str 'type'
+
+    Same shape as the original generated FIELD_TYPES, so info['type'] == 'checkbox'
+    keeps working; identical fields share one mapping.
+    """
+    canonical = {}
+    fields = {}
+    for entry_id in _load().field_index:
+        spec = get_field(entry_id)
+        if spec not in canonical:
+            canonical[spec] = MappingProxyType({
+                'type': spec.type.name.lower(),
+                'multiple_values': spec.multiple_values,
+                'has_other_option': spec.has_other_option,
+                'sample_values': spec.sample_values,
+            })
+        fields[entry_id] = canonical[spec]
+    return MappingProxyType(fields)
+
+
+def __getattr__(name):
+    """Resolve FIELD_TYPES and the table columns (FIELD_INDEX, TYPES, ...) on first access"""
+    if name == 'FIELD_TYPES':
+        value = all_fields()
+    elif name.lower() in _Table._fields:
+        value = getattr(_load(), name.lower())
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+'''
\ No newline at end of file
@@ -2,20 +2,55 @@
 Utility functions and helpers
 """
 
+import csv
 import logging
-import pandas as pd
+from importlib.util import find_spec
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Cek ketersediaan tanpa meng-import; pandas/pyarrow baru di-load saat membaca file
+PYARROW_AVAILABLE = find_spec('pyarrow') is not None
+CALAMINE_AVAILABLE = find_spec('python_calamine') is not None
 
 logger = logging.getLogger(__name__)
 
+# Data contoh untuk --create-sample (read-only, dibangun sekali saat import)
+SAMPLE_CSV_DATA = MappingProxyType({
+    'entry.625591749': ('Option 1', 'Option 2', 'Option 3'),
+    'eta': ('2025-08-05 08:00:00', '2025-08-05 08:05:00', '2025-08-05 08:10:00'),
+    'priority': ('high', 'normal', 'low')
+})
+
+
+def read_data_file(source, file_ext: str, **kwargs) -> 'pd.DataFrame':
+    """Read CSV/Excel data, using the Arrow-backed parser when pyarrow is installed
+
+    Excel files go through the Rust calamine reader when python-calamine is
+    installed instead of openpyxl's much slower XML DOM parser.
+    """
+    import pandas as pd
+    
+    if PYARROW_AVAILABLE:
+        kwargs.setdefault('dtype_backend', 'pyarrow')
+        # The pyarrow CSV engine does not support partial reads
+        if file_ext == '.csv' and 'nrows' not in kwargs:
+            kwargs.setdefault('engine', 'pyarrow')
+    
+    if file_ext == '.csv':
+        return pd.read_csv(source, **kwargs)
+    if CALAMINE_AVAILABLE:
+        kwargs.setdefault('engine', 'calamine')
+    return pd.read_excel(source, **kwargs)
+
 
 def create_sample_csv(filename: str = 'sample_data.csv'):
     """Create sample CSV file"""
-    data = {
-        'entry.625591749': ['Option 1', 'Option 2', 'Option 3'],
-        'eta': ['2025-08-05 08:00:00', '2025-08-05 08:05:00', '2025-08-05 08:10:00'],
-        'priority': ['high', 'normal', 'low']
-    }
-    
-    df = pd.DataFrame(data)
-    df.to_csv(filename, index=False)
+    # Tiga baris teks: csv stdlib cukup, tidak perlu membangun DataFrame
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(SAMPLE_CSV_DATA.keys())
+        writer.writerows(zip(*SAMPLE_CSV_DATA.values()))
     logger.info(f"✅ Sample CSV created: {filename}")
\ No newline at end of file
@@ -4,14 +4,25 @@ URL parameter parser to extract entry IDs in order
 
 import re
 import logging
+from functools import lru_cache
 from urllib.parse import urlparse, parse_qs
-from typing import List
+from typing import List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Pola parameter entry pada query string prefilled URL
+ENTRY_PARAM_RE = re.compile(r'entry\.(\d+)=')
+
 
 def extract_entry_order_from_url(form_url: str) -> List[str]:
     """Extract entry IDs in order from prefilled URL"""
+    # Salinan list supaya caller bebas memodifikasi tanpa merusak cache
+    return list(_parse_entry_order(form_url))
+
+
+@lru_cache(maxsize=128)
+def _parse_entry_order(form_url: str) -> Tuple[str, ...]:
+    """Parse entry IDs sekali per URL (di-cache, dipanggil di setiap submit)"""
     try:
         # Parse URL to get query parameters
         parsed_url = urlparse(form_url)
@@ -20,24 +31,17 @@ def extract_entry_order_from_url(form_url: str) -> List[str]:
         query_string = parsed_url.query
         
         # Extract all entry parameters in order they appear
-        entry_pattern = r'entry\.(\d+)='
-        entries = re.findall(entry_pattern, query_string)
+        entries = ENTRY_PARAM_RE.findall(query_string)
         
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_entries = []
-        for entry in entries:
-            entry_key = f"entry.{entry}"
-            if entry_key not in seen:
-                seen.add(entry_key)
-                unique_entries.append(entry_key)
+        # Remove duplicates while preserving order (dict keeps insertion order)
+        unique_entries = tuple(f"entry.{entry}" for entry in dict.fromkeys(entries))
         
         logger.info(f"✅ Extracted {len(unique_entries)} entry IDs from URL in order")
         return unique_entries
         
     except Exception as e:
         logger.error(f"Error extracting entry order from URL: {e}")
-        return []
+        return ()
 
 
 def get_clean_form_url(form_url: str) -> str: